@@ -2,12 +2,15 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import threading
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 
 # Import automation modules
 import sys
-sys.path.append(str(Path(__file__).parent.parent))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from main import WiFiAutomationSystem
 from modules.scheduler import automation_scheduler
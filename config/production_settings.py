@@ -50,6 +50,7 @@ WIFI_CONFIG = {
 VBS_CONFIG = {
     'primary_path': os.getenv('VBS_PRIMARY_PATH', r'C:\Users\Lenovo\Music\moonflower\AbsonsItERP.exe - Shortcut.lnk'),
     'fallback_path': os.getenv('VBS_FALLBACK_PATH', r'\\192.168.10.16\e\ArabianLive\ArabianLive_MoonFlower\AbsonsItERP.exe'),
+    'process_name': os.getenv('VBS_PROCESS_NAME', 'AbsonsItERP.exe'),
     'username': os.getenv('VBS_USERNAME', 'Vj'),
     'password': os.getenv('VBS_PASSWORD', ''),  # Use environment variable in production
     'default_date': os.getenv('VBS_DEFAULT_DATE', '01/01/2023'),
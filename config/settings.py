@@ -119,6 +119,7 @@ WIFI_CONFIG = {
 VBS_CONFIG = {
     'primary_path': r'C:\Users\Lenovo\Music\moonflower\AbsonsItERP.exe - Shortcut.lnk',
     'fallback_path': r'\\192.168.10.16\e\ArabianLive\ArabianLive_MoonFlower\AbsonsItERP.exe',
+    'process_name': 'AbsonsItERP.exe',
     'username': 'Vj',
     'password': '',
     'default_date': '01/01/2023',
@@ -1,10 +1,54 @@
 import logging
 import logging.handlers
+import threading
 from pathlib import Path
 from config.settings import LOGS_DIR, LOGGING_CONFIG
 import json
 from datetime import datetime
 
+class BufferedHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes every flush_interval seconds from a background thread"""
+    
+    def __init__(self, target, capacity=512, flush_interval=1.0):
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target)
+        self.flush_interval = flush_interval
+        # Flush on a timer so idle periods do not leave records sitting in memory
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="log-flusher", daemon=True)
+        self._flusher.start()
+    
+    def _flush_periodically(self):
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
+    
+    def close(self):
+        self._stop_flushing.set()
+        super().close()
+    
+    def flush(self):
+        """Write all buffered records to the rotating target file in a single write"""
+        with self.lock:
+            target = self.target
+            if target is None or not self.buffer:
+                return
+            records = [r for r in self.buffer if r.levelno >= target.level and target.filter(r)]
+            self.buffer.clear()
+            if not records:
+                return
+            target.acquire()
+            try:
+                payload = "".join(target.format(r) + target.terminator for r in records)
+                if target.shouldRollover(records[0]):
+                    target.doRollover()
+                if target.stream is None:
+                    target.stream = target._open()
+                target.stream.write(payload)
+                target.stream.flush()
+            except Exception:
+                target.handleError(records[-1])
+            finally:
+                target.release()
+
 class AutomationLogger:
     def __init__(self, name="WiFiAutomation"):
         self.logger = logging.getLogger(name)
@@ -15,14 +59,20 @@ class AutomationLogger:
             self._setup_handlers()
     
     def _setup_handlers(self):
+        # Log files are opened on first write, so errors.log stays closed until an error occurs
         # File handler with rotation
         file_handler = logging.handlers.RotatingFileHandler(
             LOGS_DIR / "automation.log",
             maxBytes=LOGGING_CONFIG['max_file_size'],
-            backupCount=LOGGING_CONFIG['backup_count']
+            backupCount=LOGGING_CONFIG['backup_count'],
+            delay=True
         )
         file_handler.setLevel(logging.INFO)
         
+        # Buffer file writes; errors, a full buffer or the 1s flush timer write them out
+        buffered_file_handler = BufferedHandler(file_handler)
+        buffered_file_handler.setLevel(logging.INFO)
+        
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
@@ -31,7 +81,8 @@ class AutomationLogger:
         error_handler = logging.handlers.RotatingFileHandler(
             LOGS_DIR / "errors.log",
             maxBytes=LOGGING_CONFIG['max_file_size'],
-            backupCount=LOGGING_CONFIG['backup_count']
+            backupCount=LOGGING_CONFIG['backup_count'],
+            delay=True
         )
         error_handler.setLevel(logging.ERROR)
         
@@ -42,11 +93,19 @@ class AutomationLogger:
         error_handler.setFormatter(formatter)
         
         # Add handlers
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(buffered_file_handler)
         self.logger.addHandler(console_handler)
         self.logger.addHandler(error_handler)
     
+    def flush(self):
+        """Flush any buffered records to disk"""
+        for handler in self.logger.handlers:
+            handler.flush()
+    
     def info(self, message, component="System", execution_id=None):
+        # Skip building the timestamp and JSON payload when the level is disabled
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         log_data = {
             'component': component,
             'execution_id': execution_id,
@@ -55,6 +114,8 @@ class AutomationLogger:
         self.logger.info(f"[{component}] {message} | {json.dumps(log_data)}")
     
     def warning(self, message, component="System", execution_id=None):
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         log_data = {
             'component': component,
             'execution_id': execution_id,
@@ -63,15 +124,21 @@ class AutomationLogger:
         self.logger.warning(f"[{component}] {message} | {json.dumps(log_data)}")
     
     def error(self, message, component="System", execution_id=None, exception=None):
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         log_data = {
             'component': component,
             'execution_id': execution_id,
             'timestamp': datetime.now().isoformat(),
             'exception': str(exception) if exception else None
         }
-        self.logger.error(f"[{component}] {message} | {json.dumps(log_data)}")
+        # Attach the traceback only when DEBUG is on; the formatter renders it lazily
+        exc_info = exception if exception and self.logger.isEnabledFor(logging.DEBUG) else None
+        self.logger.error(f"[{component}] {message} | {json.dumps(log_data)}", exc_info=exc_info)
     
     def success(self, message, component="System", execution_id=None):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         log_data = {
             'component': component,
             'execution_id': execution_id,
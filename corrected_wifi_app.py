@@ -6,6 +6,7 @@ Uses exact iframe and selector information from clickshtml.txt
 import sys
 import os
 import time
+import argparse
 from datetime import datetime
 from pathlib import Path
 from selenium import webdriver
@@ -449,6 +450,10 @@ class CorrectedWiFiApp:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Corrected WiFi Data Automation App")
+    parser.add_argument("--no-wait", action="store_true", help="Exit without waiting for Enter")
+    args = parser.parse_args()
+    
     app = CorrectedWiFiApp()
     success = app.run_corrected_automation()
     
@@ -463,8 +468,9 @@ def main():
         print("Check the console output for details")
         print("=" * 60)
     
-    print("\nPress Enter to exit...")
-    input()
+    if not args.no_wait:
+        print("\nPress Enter to exit...")
+        input()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -8,6 +8,7 @@ import os
 import sys
 import time
 import logging
+import logging.handlers
 import subprocess
 import psutil
 from datetime import datetime
@@ -16,7 +17,8 @@ from typing import Dict, List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from config.settings import config
 
@@ -40,10 +42,13 @@ class ErrorRecoverySystem:
         
         # Create logs directory if it doesn't exist
         log_dir = self.config.get_log_directory()
-        log_file = log_dir / f"error_recovery_{datetime.now().strftime('%Y%m%d')}.log"
+        log_file = log_dir / "error_recovery.log"
         
         if not logger.handlers:
-            file_handler = logging.FileHandler(log_file)
+            # One rotating file reused across runs instead of a new file per day
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=5 * 1024 * 1024, backupCount=5, delay=True
+            )
             file_handler.setLevel(logging.DEBUG)
             
             console_handler = logging.StreamHandler()
@@ -14,7 +14,9 @@ from pathlib import Path
 from typing import Dict, Any, List
 
 # Add project root to path
-sys.path.append(str(Path(__file__).parent))
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 # Local imports
 from config.settings import (
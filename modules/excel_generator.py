@@ -8,7 +8,6 @@ Based on csvtoexcel.txt reference implementation
 import os
 import sys
 import logging
-import traceback
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
@@ -330,8 +329,7 @@ class EnhancedExcelGenerator:
             
         except Exception as e:
             error_msg = f"Excel generation failed: {e}"
-            self.logger.error(error_msg)
-            self.logger.error(traceback.format_exc())
+            self.logger.exception(error_msg)
             return {"success": False, "error": error_msg}
     
     def generate_excel_from_csv_directory(self, csv_directory: Union[str, Path], 
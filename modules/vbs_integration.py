@@ -1,22 +1,27 @@
 import time
+import random
+import re
 import subprocess
 import os
-import pyautogui
-import pygetwindow as gw
+import socket
+import ctypes
+from ctypes import wintypes
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, date
 from pathlib import Path
-import cv2
-import numpy as np
-from PIL import Image
+import psutil
 import win32gui
 import win32con
 import win32api
+import win32process
 from config.settings import VBS_CONFIG
 from core.logger import logger
 import sys
 
 # Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Import config with fallback
 try:
@@ -34,128 +39,812 @@ except ImportError:
     
     config = SimpleConfig()
 
-# Configure pyautogui
-pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 1
+_pyautogui = None
+
+def _get_pyautogui():
+    """Import and configure pyautogui on first use; the import pulls in PIL and pyscreeze"""
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+        # Every call site already sleeps explicitly where VBS needs time,
+        # so the implicit per-call pause only adds dead time between keystrokes
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = 0
+        _pyautogui = pyautogui
+    return _pyautogui
+
+# Pre-resolved user32 prototypes for the Win32 calls made on every check
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+_IsWindow = _user32.IsWindow
+_IsWindow.argtypes = [wintypes.HWND]
+_IsWindow.restype = wintypes.BOOL
+
+_OpenInputDesktop = _user32.OpenInputDesktop
+_OpenInputDesktop.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+_OpenInputDesktop.restype = wintypes.HANDLE
+
+_CloseDesktop = _user32.CloseDesktop
+_CloseDesktop.argtypes = [wintypes.HANDLE]
+_CloseDesktop.restype = wintypes.BOOL
+
+SEE_MASK_NOCLOSEPROCESS = 0x00000040
+SEE_MASK_NOASYNC = 0x00000100
+INPUT_IDLE_TIMEOUT_MS = 10000
+
+
+class _SHELLEXECUTEINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("fMask", wintypes.ULONG),
+        ("hwnd", wintypes.HWND),
+        ("lpVerb", wintypes.LPCWSTR),
+        ("lpFile", wintypes.LPCWSTR),
+        ("lpParameters", wintypes.LPCWSTR),
+        ("lpDirectory", wintypes.LPCWSTR),
+        ("nShow", ctypes.c_int),
+        ("hInstApp", wintypes.HINSTANCE),
+        ("lpIDList", ctypes.c_void_p),
+        ("lpClass", wintypes.LPCWSTR),
+        ("hkeyClass", wintypes.HKEY),
+        ("dwHotKey", wintypes.DWORD),
+        ("hIconOrMonitor", wintypes.HANDLE),
+        ("hProcess", wintypes.HANDLE),
+    ]
+
+
+_ShellExecuteEx = ctypes.WinDLL("shell32", use_last_error=True).ShellExecuteExW
+_ShellExecuteEx.argtypes = [ctypes.POINTER(_SHELLEXECUTEINFO)]
+_ShellExecuteEx.restype = wintypes.BOOL
+
+_WaitForInputIdle = _user32.WaitForInputIdle
+_WaitForInputIdle.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+_WaitForInputIdle.restype = wintypes.DWORD
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_GetProcessId = _kernel32.GetProcessId
+_GetProcessId.argtypes = [wintypes.HANDLE]
+_GetProcessId.restype = wintypes.DWORD
+_CloseHandle = _kernel32.CloseHandle
+_CloseHandle.argtypes = [wintypes.HANDLE]
+_CloseHandle.restype = wintypes.BOOL
+
+_FindWindow = _user32.FindWindowW
+_FindWindow.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR]
+_FindWindow.restype = wintypes.HWND
+
+_FindWindowEx = _user32.FindWindowExW
+_FindWindowEx.argtypes = [wintypes.HWND, wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR]
+_FindWindowEx.restype = wintypes.HWND
+
+# Window enumeration through user32 directly; the callbacks run once per window
+_WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+_EnumWindows = _user32.EnumWindows
+_EnumWindows.argtypes = [_WNDENUMPROC, wintypes.LPARAM]
+_EnumWindows.restype = wintypes.BOOL
+
+_EnumThreadWindows = _user32.EnumThreadWindows
+_EnumThreadWindows.argtypes = [wintypes.DWORD, _WNDENUMPROC, wintypes.LPARAM]
+_EnumThreadWindows.restype = wintypes.BOOL
+
+_IsWindowVisible = _user32.IsWindowVisible
+_IsWindowVisible.argtypes = [wintypes.HWND]
+_IsWindowVisible.restype = wintypes.BOOL
+
+_GetWindowText = _user32.GetWindowTextW
+_GetWindowText.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+_GetWindowText.restype = ctypes.c_int
+
+_GetClassName = _user32.GetClassNameW
+_GetClassName.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+_GetClassName.restype = ctypes.c_int
+
+_GetWindowThreadProcessId = _user32.GetWindowThreadProcessId
+_GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+_GetWindowThreadProcessId.restype = wintypes.DWORD
+
+_SendMessage = _user32.SendMessageW
+_SendMessage.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+_SendMessage.restype = wintypes.LPARAM
+
+_GetDlgItem = _user32.GetDlgItem
+_GetDlgItem.argtypes = [wintypes.HWND, ctypes.c_int]
+_GetDlgItem.restype = wintypes.HWND
+
+# Shell, IME and tooltip windows that can never be a VBS window; skipped before their titles are read
+_SKIPPED_WINDOW_CLASSES = frozenset({
+    "tooltips_class32",
+    "IME",
+    "MSCTFIME UI",
+    "Shell_TrayWnd",
+    "Shell_SecondaryTrayWnd",
+    "Progman",
+    "WorkerW",
+})
+
+def _list_windows(enum, *args):
+    """Run a user32 window enumeration and return (hwnd, title, pid) for each visible titled window
+
+    One text buffer and PID slot are reused for every window; destroyed windows simply read as empty.
+    """
+    windows = []
+    buffer = ctypes.create_unicode_buffer(512)
+    class_name = ctypes.create_unicode_buffer(256)
+    pid = wintypes.DWORD()
+    
+    @_WNDENUMPROC
+    def enum_callback(hwnd, _):
+        if not _IsWindowVisible(hwnd):
+            return True
+        _GetClassName(hwnd, class_name, len(class_name))
+        if class_name.value in _SKIPPED_WINDOW_CLASSES:
+            return True
+        if _GetWindowText(hwnd, buffer, len(buffer)):
+            _GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            windows.append((hwnd, buffer.value, pid.value))
+        return True
+    
+    enum(*args, enum_callback, 0)
+    return windows
+
+DESKTOP_SWITCHDESKTOP = 0x0100
+
+# Common file dialog control IDs: file name combo box (Explorer style), plain edit (legacy), OK button
+FILE_NAME_COMBO_ID = 0x47C
+FILE_NAME_EDIT_ID = 0x480
+IDOK = 1
+
+class _GUITHREADINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("hwndActive", wintypes.HWND),
+        ("hwndFocus", wintypes.HWND),
+        ("hwndCapture", wintypes.HWND),
+        ("hwndMenuOwner", wintypes.HWND),
+        ("hwndMoveSize", wintypes.HWND),
+        ("hwndCaret", wintypes.HWND),
+        ("rcCaret", wintypes.RECT),
+    ]
+
+_GetGUIThreadInfo = _user32.GetGUIThreadInfo
+_GetGUIThreadInfo.argtypes = [wintypes.DWORD, ctypes.POINTER(_GUITHREADINFO)]
+_GetGUIThreadInfo.restype = wintypes.BOOL
+
+# Window classes of text input controls (Win32 Edit, VB6 and WinForms text boxes)
+_EDIT_CLASS_RE = re.compile(r"edit|textbox", re.IGNORECASE)
+
+# Window classes of push buttons (Win32, VB6 and WinForms)
+_BUTTON_CLASS_RE = re.compile(r"button", re.IGNORECASE)
+
+# Title keywords identifying the VBS main window, matched case-insensitively in one pass
+_VBS_TITLE_RE = re.compile(
+    "|".join(re.escape(keyword) for keyword in ("AbsonsItERP", "ERP", "Absons", "VBS", "Application")),
+    re.IGNORECASE,
+)
+
+# Shell prompt shown when the fallback executable is started from the network share
+SECURITY_WARNING_TITLES = ("Open File - Security Warning", "Security Warning")
+
+# SendInput structures; MOUSEINPUT is only declared so INPUT has its native size
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", wintypes.WPARAM),
+    ]
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", wintypes.WPARAM),
+    ]
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+_SendInput = _user32.SendInput
+_SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int]
+_SendInput.restype = wintypes.UINT
+
+def _key_input(vk=0, scan=0, flags=0):
+    return _INPUT(type=INPUT_KEYBOARD, union=_INPUTUNION(ki=_KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)))
+
+def _send_inputs(inputs):
+    """Inject a batch of input events with a single SendInput call"""
+    array = (_INPUT * len(inputs))(*inputs)
+    if _SendInput(len(inputs), array, ctypes.sizeof(_INPUT)) != len(inputs):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+def _press_keys(*vks):
+    """Press a key or chord: keys go down in order and come up in reverse"""
+    _send_inputs(
+        [_key_input(vk) for vk in vks]
+        + [_key_input(vk, flags=KEYEVENTF_KEYUP) for vk in reversed(vks)]
+    )
+
+def _clear_field():
+    """Select all and delete in the focused field as one SendInput batch"""
+    _send_inputs([
+        _key_input(win32con.VK_CONTROL),
+        _key_input(ord('A')),
+        _key_input(ord('A'), flags=KEYEVENTF_KEYUP),
+        _key_input(win32con.VK_CONTROL, flags=KEYEVENTF_KEYUP),
+        _key_input(win32con.VK_DELETE),
+        _key_input(win32con.VK_DELETE, flags=KEYEVENTF_KEYUP),
+    ])
+
+def _type_text(text):
+    """Type text as Unicode key events, independent of keyboard layout and shift state"""
+    if not text:
+        return
+    inputs = []
+    for char in text:
+        code = ord(char)
+        inputs.append(_key_input(scan=code, flags=KEYEVENTF_UNICODE))
+        inputs.append(_key_input(scan=code, flags=KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    _send_inputs(inputs)
+
+# Longest wait for the launch path probes; an unreachable share can block os.path.exists for much longer
+PATH_PROBE_TIMEOUT = 2.0
+# A share host that does not accept SMB connections within this time is treated as offline
+SHARE_CONNECT_TIMEOUT = 0.3
+SMB_PORT = 445
+
+# Launch paths found to exist and when they were found, shared by every VBSIntegration in this
+# process; entries expire so a restored primary path or a removed one is noticed
+LAUNCH_PATH_CACHE_TTL = 600
+_resolved_launch_paths = None
+_resolved_launch_paths_ts = 0.0
+
+def _cached_launch_paths():
+    """Return the shared launch paths if they are still fresh, otherwise None"""
+    if _resolved_launch_paths and time.monotonic() - _resolved_launch_paths_ts < LAUNCH_PATH_CACHE_TTL:
+        return _resolved_launch_paths
+    return None
+
+def _launch_path_exists(path):
+    """os.path.exists that first checks a UNC share's host is reachable, so an offline share fails fast
+
+    Returns None when the host cannot be reached, since the path may still exist.
+    """
+    if path.startswith("\\\\"):
+        host = path[2:].split("\\", 1)[0]
+        try:
+            socket.create_connection((host, SMB_PORT), timeout=SHARE_CONNECT_TIMEOUT).close()
+        except OSError:
+            return None
+    return os.path.exists(path)
+
+# Step failures that another attempt cannot fix
+_TERMINAL_ERRORS = (
+    "Neither primary nor fallback VBS application path exists",
+    "VBS application was closed",
+)
+
+def _retry(attempts, base=1.0, cap=8.0, deadline=None, jitter=0.1, wait=time.sleep):
+    """Yield attempt numbers with jittered exponential backoff between them, bounded by an optional deadline
+
+    wait(delay) performs the backoff; a truthy return value stops further attempts.
+    """
+    start = time.monotonic()
+    for attempt in range(attempts):
+        if attempt:
+            delay = min(cap, base * 2 ** (attempt - 1))
+            delay += random.uniform(0, jitter * delay)
+            if deadline is not None:
+                remaining = deadline - (time.monotonic() - start)
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            if wait(delay):
+                return
+        yield attempt
 
 class VBSIntegration:
-    def __init__(self, execution_id=None):
+    def __init__(self, execution_id=None, executor=None):
         self.execution_id = execution_id
-        self.app_window = None
+        
+        # Importing pyautogui used to make the process DPI aware; do it once automation is set up,
+        # not at import, so window rectangles and click coordinates agree before pyautogui loads
+        _user32.SetProcessDPIAware()
         self.app_process = None
+        self.window_handle = None
+        self.process_id = None
+        self.last_error = None
+        self.launched_pid = None
+        self.login_window = None
+        self.login_title = None
+        self._last_login_check = None
+        self._thread_ids = {}
+        self._snapshot = None
+        self._snapshot_ts = 0.0
+        self._path_probes = None
+        self._launch_paths_found = None
+        self._unchecked_launch_paths = []
+        
+        # Background work runs on a caller-supplied pool, or one created on first use
+        self._executor = executor
+        self._owns_executor = False
         
+        # Methods called outside a workflow still get timestamps to name their files
+        self._start_run()
+        
+    def _start_run(self):
+        """Format this run's timestamps once; reused by report names and screenshots"""
+        self.started_at = datetime.now()
+        self.run_date = self.started_at.strftime("%d%m%Y")
+        self.run_timestamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        self._screenshot_count = 0
+    
+    def _get_executor(self):
+        """Return the executor for background work, creating an owned one if needed"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="VBSIntegration")
+            self._owns_executor = True
+        return self._executor
+    
+    def _is_workstation_locked(self):
+        """Check whether the interactive desktop is locked and cannot receive input"""
+        try:
+            desktop = _OpenInputDesktop(0, False, DESKTOP_SWITCHDESKTOP)
+            if not desktop:
+                return True
+            _CloseDesktop(desktop)
+            return False
+        except Exception as e:
+            logger.warning(f"Could not determine workstation lock state: {str(e)}", "VBSIntegration", self.execution_id)
+            return False
+    
+    def _find_existing_vbs(self):
+        """Find an already running VBS instance and reuse its main window"""
+        try:
+            process_name = VBS_CONFIG['process_name'].lower()
+            pids = set()
+            for proc in psutil.process_iter(['pid', 'name']):
+                try:
+                    if (proc.info['name'] or '').lower() == process_name:
+                        pids.add(proc.info['pid'])
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            
+            if not pids:
+                return False
+            
+            # Enumerate only the VBS processes' own threads rather than every desktop window
+            windows = []
+            for pid in pids:
+                try:
+                    windows.extend((hwnd, pid) for hwnd, _, _ in self._process_windows(pid))
+                except psutil.NoSuchProcess:
+                    continue
+            
+            if not windows:
+                return False
+            
+            # Prefer a usable top-level window over a message box or a window disabled behind one
+            windows.sort(key=lambda window: win32gui.GetClassName(window[0]) == "#32770" or not win32gui.IsWindowEnabled(window[0]))
+            hwnd, pid = windows[0]
+            
+            # Navigation clicks screen positions, so the reused window must be restored and in front
+            self._bring_to_foreground(hwnd)
+            if not self._wait_until(lambda: win32gui.GetForegroundWindow() == hwnd, timeout=2):
+                logger.warning(f"Could not bring running VBS instance (PID {pid}) to the foreground - not reusing it", "VBSIntegration", self.execution_id)
+                return False
+            
+            self.window_handle, self.process_id = hwnd, pid
+            logger.info(f"Reusing running VBS instance (PID {self.process_id}) - skipping launch", "VBSIntegration", self.execution_id)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error probing for running VBS instance: {str(e)}", "VBSIntegration", self.execution_id, e)
+            return False
+    
     def launch_application(self):
         """Launch VBS application with fallback paths"""
         try:
-            logger.info("Launching VBS application", "VBSIntegration", self.execution_id)
+            # A failed attempt may have started VBS without finding its window; stop that
+            # instance before starting another so it is not orphaned
+            if self.app_process or self.launched_pid:
+                self._terminate_launched_process()
+                self.reset()
             
             # Try primary path first
-            if os.path.exists(VBS_CONFIG['primary_path']):
-                logger.info(f"Using primary path: {VBS_CONFIG['primary_path']}", "VBSIntegration", self.execution_id)
-                self.app_process = subprocess.Popen([VBS_CONFIG['primary_path']])
-            elif os.path.exists(VBS_CONFIG['fallback_path']):
-                logger.info(f"Using fallback path: {VBS_CONFIG['fallback_path']}", "VBSIntegration", self.execution_id)
+            launch_paths = self._launch_paths()
+            on_poll = None
+            if VBS_CONFIG['primary_path'] in launch_paths:
+                logger.info(f"Launching VBS application from primary path: {VBS_CONFIG['primary_path']}", "VBSIntegration", self.execution_id)
+                self._open_shortcut(VBS_CONFIG['primary_path'])
+            elif VBS_CONFIG['fallback_path'] in launch_paths:
+                logger.info(f"Launching VBS application from fallback path: {VBS_CONFIG['fallback_path']}", "VBSIntegration", self.execution_id)
                 self.app_process = subprocess.Popen([VBS_CONFIG['fallback_path']])
+                self.process_id = self.launched_pid = self.app_process.pid
+                # Only the network executable raises the shell's security prompt
+                on_poll = self._handle_security_popup
+            elif self._unchecked_launch_paths:
+                # A slow or unreachable share is temporary, so this stays retryable
+                raise Exception(f"Could not check VBS application path: {', '.join(self._unchecked_launch_paths)}")
             else:
                 raise Exception("Neither primary nor fallback VBS application path exists")
+            self._invalidate_windows()
             
-            # Wait for application to start
-            time.sleep(10)
-            
-            # Find application window
-            if not self._find_application_window():
+            # Poll for the application window instead of sleeping a fixed startup time
+            if not self._find_application_window(on_poll=on_poll):
                 raise Exception("Could not find VBS application window")
             
             logger.success("VBS application launched successfully", "VBSIntegration", self.execution_id)
             return True
             
         except Exception as e:
+            self.last_error = str(e)
+            # The path that was used may have gone away; let the retry or next run re-check it
+            self._forget_launch_paths()
             logger.error(f"Failed to launch VBS application: {str(e)}", "VBSIntegration", self.execution_id, e)
             return False
     
-    def _find_application_window(self, max_attempts=10):
-        """Find and focus VBS application window"""
-        try:
-            window_titles = [
-                "AbsonsItERP",
-                "ERP",
-                "Absons",
-                "VBS",
-                "Application"
+    def _probe_launch_paths(self):
+        """Start checking the VBS launch paths in the background, once per session"""
+        if self._path_probes is None and not _cached_launch_paths():
+            executor = self._get_executor()
+            self._path_probes = [
+                (path, executor.submit(_launch_path_exists, path))
+                for path in (VBS_CONFIG['primary_path'], VBS_CONFIG['fallback_path'])
             ]
+    
+    def _launch_paths(self):
+        """Return the VBS launch paths that exist; probes are bounded and their result reused by retries and later runs"""
+        global _resolved_launch_paths, _resolved_launch_paths_ts
+        if self._launch_paths_found is None:
+            self._launch_paths_found = _cached_launch_paths()
+        if self._launch_paths_found is None:
+            self._probe_launch_paths()
+            deadline = time.monotonic() + PATH_PROBE_TIMEOUT
+            found = []
+            self._unchecked_launch_paths = []
+            for path, probe in self._path_probes:
+                try:
+                    exists = probe.result(timeout=max(0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    exists = None
+                    logger.warning(f"Timed out checking VBS path: {path}", "VBSIntegration", self.execution_id)
+                if exists:
+                    found.append(path)
+                elif exists is None:
+                    self._unchecked_launch_paths.append(path)
+            self._launch_paths_found = found
+            # Only a successful lookup is shared; an empty one is retried by the next run
+            if found:
+                _resolved_launch_paths, _resolved_launch_paths_ts = found, time.monotonic()
+        return self._launch_paths_found
+    
+    def _forget_launch_paths(self):
+        """Drop cached launch paths so the next attempt probes them again"""
+        global _resolved_launch_paths
+        _resolved_launch_paths = None
+        self._path_probes = None
+        self._launch_paths_found = None
+        self._unchecked_launch_paths = []
+    
+    def _open_shortcut(self, path):
+        """Open a .lnk through the shell and wait until the launched process is ready for input"""
+        info = _SHELLEXECUTEINFO(
+            fMask=SEE_MASK_NOCLOSEPROCESS | SEE_MASK_NOASYNC,
+            lpVerb="open",
+            lpFile=path,
+            nShow=win32con.SW_SHOWNORMAL,
+        )
+        info.cbSize = ctypes.sizeof(info)
+        if not _ShellExecuteEx(ctypes.byref(info)):
+            raise Exception(f"ShellExecuteEx failed for {path}: {ctypes.FormatError(ctypes.get_last_error())}")
+        self.app_process = None
+        
+        # hProcess is NULL when the shell hands the launch to an existing instance
+        if info.hProcess:
+            try:
+                self.process_id = self.launched_pid = _GetProcessId(info.hProcess) or None
+                _WaitForInputIdle(info.hProcess, INPUT_IDLE_TIMEOUT_MS)
+            finally:
+                _CloseHandle(info.hProcess)
+    
+    def _terminate_launched_process(self):
+        """Stop the VBS process this instance launched; a process it did not start is left running"""
+        if self.app_process:
+            self.app_process.terminate()
+            logger.info("VBS application terminated", "VBSIntegration", self.execution_id)
+        elif self.launched_pid:
+            # Shortcut launches leave no Popen handle; stop only the process the launch itself
+            # reported, never whichever program happens to own the window that was found
+            try:
+                psutil.Process(self.launched_pid).terminate()
+                logger.info("VBS application terminated", "VBSIntegration", self.execution_id)
+            except psutil.NoSuchProcess:
+                pass
+        self.app_process = None
+        self.launched_pid = None
+    
+    def get_window_handle(self):
+        """Return the VBS main window handle found by the launch or instance lookup"""
+        return self.window_handle
+    
+    def get_process_id(self):
+        """Return the VBS process ID, resolving it once per session"""
+        if self.process_id is None:
+            hwnd = self.get_window_handle()
+            if hwnd:
+                _, self.process_id = win32process.GetWindowThreadProcessId(hwnd)
+            elif self.app_process:
+                self.process_id = self.app_process.pid
+        return self.process_id
+    
+    def _is_vbs_still_running(self):
+        """Check that the VBS window or, once it is replaced, the VBS process still exists; unknown handles count as running"""
+        hwnd = self.get_window_handle()
+        if not hwnd or _IsWindow(hwnd):
+            return True
+        # The tracked window can close without VBS exiting, e.g. a login form replaced by the main window
+        pid = self.get_process_id()
+        return bool(pid) and psutil.pid_exists(pid)
+    
+    def _ensure_vbs_running(self, step):
+        """Fail fast instead of sending input to a closed VBS window"""
+        if not self._is_vbs_still_running():
+            raise Exception(f"VBS application was closed before {step}")
+    
+    def reset(self):
+        """Forget the cached VBS window and process"""
+        self.window_handle = None
+        self.process_id = None
+        self.login_window = None
+        self.login_title = None
+        self._last_login_check = None
+        self._thread_ids.clear()
+        self._snapshot = None
+    
+    def _process_windows(self, pid):
+        """Yield (hwnd, title, pid) for a process's visible titled windows, enumerating only its own threads
+
+        Windows are produced one thread at a time, so a caller that stops at the first
+        match never enumerates the remaining threads.
+        """
+        found = False
+        for refresh in (False, True):
+            thread_ids = self._thread_ids.get(pid)
+            if refresh or thread_ids is None:
+                thread_ids = self._thread_ids[pid] = [thread.id for thread in psutil.Process(pid).threads()]
+            for thread_id in thread_ids:
+                windows = _list_windows(_EnumThreadWindows, thread_id)
+                found = found or bool(windows)
+                yield from windows
+            # Only re-read the thread list when the cached one finds nothing
+            if found:
+                return
+    
+    def _wait_for_window(self, predicate, timeout, poll=0.1, on_poll=None, pid=None):
+        """Poll visible top-level windows until predicate(hwnd, title) matches; return the hwnd or None on timeout
+
+        on_poll, if given, runs before each enumeration; pid, if given, restricts the
+        search to that process's windows.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            if on_poll:
+                on_poll()
+            for hwnd, title, owner_pid in self._snapshot_windows(max_age=poll):
+                if pid is not None and owner_pid != pid:
+                    continue
+                if predicate(hwnd, title):
+                    return hwnd
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(poll)
+    
+    def _invalidate_windows(self):
+        """Drop the cached window snapshot after an action that opens or closes windows"""
+        self._snapshot = None
+    
+    def _snapshot_windows(self, max_age=0.5):
+        """Return (hwnd, title, pid) for every visible titled top-level window
+
+        One EnumWindows walk is shared by the window finders; a snapshot younger than
+        max_age seconds is reused instead of walking again.
+        """
+        now = time.perf_counter()
+        if self._snapshot is not None and now - self._snapshot_ts < max_age:
+            return self._snapshot
+        
+        self._snapshot, self._snapshot_ts = _list_windows(_EnumWindows), time.perf_counter()
+        return self._snapshot
+    
+    def _find_application_window(self, timeout=30, on_poll=None):
+        """Find and focus VBS application window; on_poll runs before each window scan"""
+        try:
+            def is_vbs_window(hwnd, title):
+                # A disabled match is a splash or busy window that cannot take input yet
+                return _VBS_TITLE_RE.search(title) is not None and win32gui.IsWindowEnabled(hwnd)
+            
+            # Once the launch reported its process, a matching title elsewhere on the desktop is not VBS
+            hwnd = self._wait_for_window(is_vbs_window, timeout, on_poll=on_poll, pid=self.process_id)
+            if not hwnd:
+                return False
+            
+            self.window_handle = hwnd
+            self._bring_to_foreground(hwnd)
+            self._wait_until(lambda: win32gui.GetForegroundWindow() == hwnd, timeout=2)
+            logger.info(f"Found VBS window: {win32gui.GetWindowText(hwnd)}", "VBSIntegration", self.execution_id)
+            return True
             
-            for attempt in range(max_attempts):
-                windows = gw.getAllWindows()
-                
-                for window in windows:
-                    for title in window_titles:
-                        if title.lower() in window.title.lower() and window.visible:
-                            self.app_window = window
-                            window.activate()
-                            time.sleep(2)
-                            logger.info(f"Found VBS window: {window.title}", "VBSIntegration", self.execution_id)
-                            return True
-                
-                time.sleep(2)
-            
+        except Exception as e:
+            logger.error(f"Error finding application window: {str(e)}", "VBSIntegration", self.execution_id, e)
+            return False
+    
+    def _bring_to_foreground(self, hwnd):
+        """Give hwnd the foreground, sharing input state with the current foreground thread so Windows allows it"""
+        if win32gui.IsIconic(hwnd):
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        
+        current_thread = win32api.GetCurrentThreadId()
+        foreground = win32gui.GetForegroundWindow()
+        foreground_thread = win32process.GetWindowThreadProcessId(foreground)[0] if foreground else 0
+        attached = False
+        if foreground_thread and foreground_thread != current_thread:
+            try:
+                win32process.AttachThreadInput(current_thread, foreground_thread, True)
+                attached = True
+            except win32gui.error:
+                pass
+        try:
+            win32gui.BringWindowToTop(hwnd)
+            win32gui.SetForegroundWindow(hwnd)
+        except win32gui.error as e:
+            logger.warning(f"Could not bring VBS window to the foreground: {str(e)}", "VBSIntegration", self.execution_id)
+        finally:
+            if attached:
+                win32process.AttachThreadInput(current_thread, foreground_thread, False)
+    
+    def _handle_security_popup(self):
+        """Accept the shell security warning for the network executable if it is showing"""
+        try:
+            exe_name = os.path.basename(VBS_CONFIG['fallback_path']).lower()
+            for title in SECURITY_WARNING_TITLES:
+                dialog = _FindWindow("#32770", title)
+                if not dialog:
+                    continue
+                # Never approve a prompt for some other file the automation did not start
+                if exe_name not in self._child_texts(dialog).lower():
+                    continue
+                run_button = _FindWindowEx(dialog, None, "Button", "&Run")
+                if not run_button:
+                    continue
+                win32gui.PostMessage(run_button, win32con.BM_CLICK, 0, 0)
+                self._invalidate_windows()
+                logger.info(f"Accepted security prompt: {title}", "VBSIntegration", self.execution_id)
+                return True
             return False
             
         except Exception as e:
-            logger.error(f"Error finding application window: {str(e)}", "VBSIntegration", self.execution_id, e)
+            logger.warning(f"Could not handle security prompt: {str(e)}", "VBSIntegration", self.execution_id)
             return False
     
+    def _child_texts(self, parent):
+        """Return the text of all of parent's child controls, one per line"""
+        texts = []
+        
+        def enum_callback(hwnd, results):
+            results.append(self._get_control_text(hwnd, max_length=1024))
+            return True
+        
+        try:
+            win32gui.EnumChildWindows(parent, enum_callback, texts)
+        except win32gui.error:
+            # Raised when the window has no children
+            pass
+        return "\n".join(texts)
+    
+    def _wait_until(self, condition, timeout, poll=0.1):
+        """Poll condition() until it is true or timeout elapses; return the last result"""
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(poll)
+        return True
+    
     def login_to_application(self):
         """Login to VBS application"""
         try:
             logger.info("Logging into VBS application", "VBSIntegration", self.execution_id)
+            self._ensure_vbs_running("login")
             
-            # Wait for login screen
-            time.sleep(3)
+            # Remember the login window so verification can tell when it is replaced
+            self.login_window = self.get_window_handle()
+            self.login_title = win32gui.GetWindowText(self.login_window) if self.login_window else None
+            
+            # Wait for the login fields to exist rather than a fixed delay
+            self._wait_until(self._login_edit_controls, timeout=3)
             
             # Take screenshot for debugging
             self._take_screenshot("login_screen")
             
-            # Find username field and enter username
-            if self._find_and_click_text_field("username", "user", "login"):
-                pyautogui.typewrite(VBS_CONFIG['username'])
-                time.sleep(1)
+            # Login form values in tab order
+            login_values = (VBS_CONFIG['username'], VBS_CONFIG['password'])
+            
+            edits = self._login_edit_controls()
+            login_fields = self._login_fields(edits)
+            if login_fields:
+                # Replace each field value outright; this also clears any leftover text
+                for edit, value in zip(login_fields, login_values):
+                    self._set_control_text(edit, value)
+                self._focus_login_field(edits.index(login_fields[-1]))
+            elif len(edits) > len(login_values):
+                # Typing from the first field would put the username into another field
+                raise Exception(f"Could not identify the username and password among {len(edits)} login fields")
             else:
-                # Fallback: click center and type
-                pyautogui.click(pyautogui.center())
-                time.sleep(1)
-                pyautogui.typewrite(VBS_CONFIG['username'])
-            
-            # Tab to password field (or click if found)
-            pyautogui.press('tab')
-            time.sleep(1)
-            
-            # Password is empty, so just press tab or enter
-            if VBS_CONFIG['password']:
-                pyautogui.typewrite(VBS_CONFIG['password'])
-            
-            # Find and click login button
-            login_clicked = False
-            login_buttons = ["login", "sign in", "enter", "ok"]
-            
-            for button_text in login_buttons:
-                if self._find_and_click_button(button_text):
-                    login_clicked = True
-                    break
-            
-            if not login_clicked:
-                # Fallback: press Enter
-                pyautogui.press('enter')
-            
-            time.sleep(5)
-            
-            # Verify login success by checking if main interface is visible
-            if self._verify_login_success():
+                # Find username field and enter username
+                if not self._focus_login_field(0):
+                    self._find_and_click_text_field("username", "user", "login")
+                
+                # Keystrokes go to whatever is in front; never type credentials into another program
+                if not self._vbs_in_foreground():
+                    raise Exception("VBS login window is not in the foreground")
+                
+                # Set the focused field directly; type only if it is not a text field or refuses WM_SETTEXT
+                username_field = self._focused_edit()
+                typed = not (username_field and self._set_control_text(username_field, VBS_CONFIG['username']))
+                if typed:
+                    _type_text(VBS_CONFIG['username'])
+                # Username, tab and password are queued in order, so one settle afterwards is enough
+                _press_keys(win32con.VK_TAB)
+                
+                # Password is empty, so just press tab or enter
+                if VBS_CONFIG['password']:
+                    _type_text(VBS_CONFIG['password'])
+                
+                if typed and username_field:
+                    # Settle only until the username field shows the typed value, capped at 300ms
+                    self._wait_until(lambda: self._get_control_text(username_field) == VBS_CONFIG['username'], timeout=0.3, poll=0.02)
+                elif typed:
+                    time.sleep(0.2)
+            
+            # Press the form's own login button, or submit with Enter from the password field
+            login_buttons = ["login", "log in", "sign in", "enter", "ok"]
+            login_button = self._find_child_button(self.login_window, *login_buttons)
+            if login_button:
+                win32gui.PostMessage(login_button, win32con.BM_CLICK, 0, 0)
+            else:
+                _press_keys(win32con.VK_RETURN)
+            
+            # Poll for the main interface instead of a fixed wait; exits as soon as login lands.
+            # If nothing happens within 2s and the login form is still up and in front, click its
+            # button with mouse messages in case it ignored BM_CLICK; a slow login just gets more time.
+            logged_in = self._wait_until(self._verify_login_success, timeout=2)
+            if not logged_in:
+                if (login_button and _IsWindow(self.login_window) and _IsWindow(login_button)
+                        and win32gui.GetForegroundWindow() == self.login_window):
+                    self._click_control(login_button)
+                logged_in = self._wait_until(self._verify_login_success, timeout=5)
+            
+            if logged_in:
                 logger.success("Login successful", "VBSIntegration", self.execution_id)
                 return True
             else:
                 raise Exception("Login verification failed")
                 
         except Exception as e:
+            self.last_error = str(e)
             logger.error(f"Login failed: {str(e)}", "VBSIntegration", self.execution_id, e)
             return False
     
@@ -195,13 +884,21 @@ class VBSIntegration:
             logger.error(f"Navigation failed: {str(e)}", "VBSIntegration", self.execution_id, e)
             return False
     
-    def upload_excel_data(self, excel_file_path):
+    def _check_excel_file(self, excel_file_path):
+        """Return an error message if the Excel file is missing, otherwise None"""
+        if not os.path.exists(excel_file_path):
+            return f"Excel file not found: {excel_file_path}"
+        return None
+    
+    def upload_excel_data(self, excel_file_path, file_checked=False):
         """Upload Excel data to VBS application"""
         try:
             logger.info(f"Uploading Excel data: {excel_file_path}", "VBSIntegration", self.execution_id)
             
-            if not os.path.exists(excel_file_path):
-                raise Exception(f"Excel file not found: {excel_file_path}")
+            if not file_checked:
+                file_error = self._check_excel_file(excel_file_path)
+                if file_error:
+                    raise Exception(file_error)
             
             # Click "New" button in header
             if not self._find_and_click_button("New", "Add", "Create"):
@@ -231,12 +928,12 @@ class VBSIntegration:
             if self._find_and_click_button("Yes", "OK", "Confirm"):
                 time.sleep(1)
             
-            # File dialog should be open - type file path
-            pyautogui.hotkey('ctrl', 'l')  # Focus address bar
-            time.sleep(1)
-            pyautogui.typewrite(excel_file_path)
-            time.sleep(1)
-            pyautogui.press('enter')
+            # File dialog should be open - set the file name directly, or type it as a fallback
+            if not self._fill_file_dialog(str(excel_file_path)):
+                _press_keys(win32con.VK_CONTROL, ord('L'))  # Focus address bar
+                time.sleep(0.2)
+                _type_text(str(excel_file_path))
+                _press_keys(win32con.VK_RETURN)
             time.sleep(3)
             
             # Select "Sheet 1" from dropdown if visible
@@ -328,16 +1025,14 @@ class VBSIntegration:
                 time.sleep(2)
             
             # Save file dialog
-            today = datetime.now().strftime("%d%m%Y")
-            filename = f"Moon Flower Active Users_{today}.pdf"
+            filename = f"Moon Flower Active Users_{self.run_date}.pdf"
             
-            pyautogui.typewrite(filename)
-            time.sleep(1)
-            pyautogui.press('enter')
-            time.sleep(5)
+            if not self._fill_file_dialog(filename):
+                _type_text(filename)
+                _press_keys(win32con.VK_RETURN)
             
-            # Verify PDF creation
-            if os.path.exists(output_path):
+            # Verify PDF creation, polling for the file instead of sleeping a fixed save time
+            if self._wait_until(lambda: os.path.exists(output_path), timeout=5):
                 logger.success(f"PDF report generated: {filename}", "VBSIntegration", self.execution_id)
                 return True
             else:
@@ -348,15 +1043,211 @@ class VBSIntegration:
             logger.error(f"PDF generation failed: {str(e)}", "VBSIntegration", self.execution_id, e)
             return False
     
+    def _login_edit_controls(self):
+        """List the login form's visible, enabled text fields in top-to-bottom, left-to-right order"""
+        if not self.login_window:
+            return []
+        edits = []
+        
+        def enum_callback(hwnd, results):
+            if not _IsWindow(hwnd):
+                return True
+            if (_EDIT_CLASS_RE.search(win32gui.GetClassName(hwnd))
+                    and win32gui.IsWindowVisible(hwnd) and win32gui.IsWindowEnabled(hwnd)):
+                left, top, _, _ = win32gui.GetWindowRect(hwnd)
+                results.append((top, left, hwnd))
+            return True
+        
+        try:
+            win32gui.EnumChildWindows(self.login_window, enum_callback, edits)
+        except win32gui.error:
+            # Raised when the window has no children
+            return []
+        return [hwnd for _, _, hwnd in sorted(edits)]
+    
+    def _is_password_field(self, hwnd):
+        """Check whether an edit control masks its input"""
+        return bool(win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE) & win32con.ES_PASSWORD)
+    
+    def _login_fields(self, edits):
+        """Return the (username, password) edits among the login form's fields, or None if they cannot be told apart
+
+        The password field is the masked one and the username field precedes it, so extra
+        fields such as company or financial year are left alone.
+        """
+        for index, edit in enumerate(edits):
+            if index and self._is_password_field(edit):
+                return edits[index - 1], edit
+        if len(edits) == 2:
+            return tuple(edits)
+        return None
+    
+    def _is_login_form(self, hwnd):
+        """Check whether hwnd is a login form, i.e. has a password field"""
+        if not hwnd:
+            return False
+        found = []
+        
+        def enum_callback(child, results):
+            if _EDIT_CLASS_RE.search(win32gui.GetClassName(child)) and self._is_password_field(child):
+                results.append(child)
+            return True
+        
+        try:
+            win32gui.EnumChildWindows(hwnd, enum_callback, found)
+        except win32gui.error:
+            # Raised when the window has no children
+            return False
+        return bool(found)
+    
+    def _focused_control(self, hwnd):
+        """Return the control holding keyboard focus in the GUI thread that owns hwnd"""
+        thread_id, _ = win32process.GetWindowThreadProcessId(hwnd)
+        info = _GUITHREADINFO(cbSize=ctypes.sizeof(_GUITHREADINFO))
+        if not _GetGUIThreadInfo(thread_id, ctypes.byref(info)):
+            return None
+        return info.hwndFocus
+    
+    def _focus_login_field(self, index):
+        """Move keyboard focus to the index-th login field, tabbing only as far as needed"""
+        try:
+            edits = self._login_edit_controls()
+            if index >= len(edits):
+                return False
+            target = edits[index]
+            focused = self._focused_control(self.login_window)
+            
+            if focused == target:
+                return True
+            if focused in edits:
+                # Tab order follows layout, so the distance is known exactly
+                steps = edits.index(focused) - index
+                key = [win32con.VK_SHIFT, win32con.VK_TAB] if steps > 0 else [win32con.VK_TAB]
+                for _ in range(abs(steps)):
+                    _press_keys(*key)
+            else:
+                self._click_control(target)
+            
+            return self._wait_until(lambda: self._focused_control(self.login_window) == target, timeout=1)
+            
+        except Exception as e:
+            logger.warning(f"Could not focus login field {index}: {str(e)}", "VBSIntegration", self.execution_id)
+            return False
+    
+    def _file_name_edit(self, dialog):
+        """Return the file name edit control of a common file dialog, or None"""
+        combo = _GetDlgItem(dialog, FILE_NAME_COMBO_ID)
+        if combo:
+            # ComboBoxEx32 -> ComboBox -> Edit in Explorer-style dialogs
+            inner = _FindWindowEx(combo, None, "ComboBox", None) or combo
+            edit = _FindWindowEx(inner, None, "Edit", None)
+            if edit:
+                return edit
+        return _GetDlgItem(dialog, FILE_NAME_EDIT_ID) or None
+    
+    def _fill_file_dialog(self, file_name, timeout=3):
+        """Set the file name in VBS's open/save dialog and confirm it, without simulated typing"""
+        try:
+            pid = self.get_process_id()
+            if not pid:
+                return False
+            found = []
+            
+            def find_dialog():
+                for hwnd, _, owner_pid in self._snapshot_windows(max_age=0.1):
+                    if owner_pid == pid and win32gui.GetClassName(hwnd) == "#32770":
+                        edit = self._file_name_edit(hwnd)
+                        if edit:
+                            found.append((hwnd, edit))
+                            return True
+                return False
+            
+            if not self._wait_until(find_dialog, timeout):
+                return False
+            
+            dialog, edit = found[0]
+            self._set_control_text(edit, file_name)
+            win32gui.PostMessage(_GetDlgItem(dialog, IDOK), win32con.BM_CLICK, 0, 0)
+            self._invalidate_windows()
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Could not fill file dialog directly: {str(e)}", "VBSIntegration", self.execution_id)
+            return False
+    
+    def _get_control_text(self, hwnd, max_length=256):
+        """Read a control's text with WM_GETTEXT, which also works across processes"""
+        buffer = ctypes.create_unicode_buffer(max_length)
+        _SendMessage(hwnd, win32con.WM_GETTEXT, max_length, ctypes.addressof(buffer))
+        return buffer.value
+    
+    def _focused_edit(self):
+        """Return the text field holding keyboard focus in VBS's foreground window, or None"""
+        # A refused foreground change leaves another program in front; never touch its fields
+        if not self._vbs_in_foreground():
+            return None
+        focused = self._focused_control(win32gui.GetForegroundWindow())
+        if not focused or not _EDIT_CLASS_RE.search(win32gui.GetClassName(focused)):
+            return None
+        return focused
+    
+    def _vbs_in_foreground(self):
+        """Check whether the foreground window belongs to the VBS process"""
+        foreground = win32gui.GetForegroundWindow()
+        pid = self.get_process_id()
+        return bool(foreground and pid) and win32process.GetWindowThreadProcessId(foreground)[1] == pid
+    
+    def _clear_focused_edit(self):
+        """Empty the focused text field with EM_SETSEL + WM_CLEAR; return False if no text field has focus"""
+        focused = self._focused_edit()
+        if not focused:
+            return False
+        _SendMessage(focused, win32con.EM_SETSEL, 0, -1)
+        _SendMessage(focused, win32con.WM_CLEAR, 0, 0)
+        return True
+    
+    def _set_control_text(self, hwnd, text):
+        """Set a text field's whole value with a single WM_SETTEXT; return whether the control accepted it"""
+        return bool(win32gui.SendMessage(hwnd, win32con.WM_SETTEXT, 0, text))
+    
+    def _find_child_button(self, parent, *texts):
+        """Return the first enabled child button of parent whose caption matches one of texts, or None"""
+        if not parent:
+            return None
+        wanted = {text.lower() for text in texts}
+        buttons = []
+        
+        def enum_callback(hwnd, results):
+            if not _IsWindow(hwnd):
+                return True
+            if (_BUTTON_CLASS_RE.search(win32gui.GetClassName(hwnd))
+                    and win32gui.IsWindowVisible(hwnd) and win32gui.IsWindowEnabled(hwnd)
+                    and win32gui.GetWindowText(hwnd).replace("&", "").strip().lower() in wanted):
+                results.append(hwnd)
+            return True
+        
+        try:
+            win32gui.EnumChildWindows(parent, enum_callback, buttons)
+        except win32gui.error:
+            # Raised when the window has no children
+            return None
+        return buttons[0] if buttons else None
+    
+    def _click_control(self, hwnd):
+        """Click the centre of a control by message, without moving the user's cursor"""
+        _, _, width, height = win32gui.GetClientRect(hwnd)
+        position = win32api.MAKELONG(width // 2, height // 2)
+        win32gui.SendMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, position)
+        win32gui.SendMessage(hwnd, win32con.WM_LBUTTONUP, 0, position)
+    
     def _find_and_click_text_field(self, *keywords):
         """Find and click text input field"""
         try:
-            # Take screenshot and analyze
-            screenshot = pyautogui.screenshot()
+            pyautogui = _get_pyautogui()
             
-            # Look for text field patterns
             # This is a simplified implementation - in practice, you'd use OCR or image recognition
-            center_x, center_y = pyautogui.center()
+            left, top, width, height = self._capture_region()
+            center_x, center_y = left + width // 2, top + height // 2
             
             # Try clicking in common text field locations
             text_field_locations = [
@@ -368,10 +1259,9 @@ class VBSIntegration:
             for x, y in text_field_locations:
                 pyautogui.click(x, y)
                 time.sleep(0.5)
-                # Test if we can type (cursor should be in text field)
-                pyautogui.typewrite("test")
-                pyautogui.hotkey('ctrl', 'a')
-                pyautogui.press('delete')
+                # Clear whatever the field holds before the caller types into it
+                if not self._clear_focused_edit() and self._vbs_in_foreground():
+                    _clear_field()
                 return True
             
             return False
@@ -383,6 +1273,8 @@ class VBSIntegration:
     def _find_and_click_button(self, *button_texts):
         """Find and click button by text"""
         try:
+            pyautogui = _get_pyautogui()
+            
             # This is a simplified implementation
             # In practice, you'd use OCR or image template matching
             
@@ -401,7 +1293,7 @@ class VBSIntegration:
                     pyautogui.click(x, y)
                     time.sleep(0.5)
                     return True
-                except:
+                except Exception:
                     continue
             
             return False
@@ -413,6 +1305,8 @@ class VBSIntegration:
     def _find_and_click_arrow_icon(self):
         """Find and click arrow icon"""
         try:
+            pyautogui = _get_pyautogui()
+            
             # Look for arrow icon in common locations
             screen_width, screen_height = pyautogui.size()
             
@@ -460,8 +1354,6 @@ class VBSIntegration:
     def _set_date_range(self):
         """Set date range for report"""
         try:
-            from datetime import datetime, date
-            
             # Get first day of current month
             today = date.today()
             first_day = today.replace(day=1)
@@ -476,9 +1368,31 @@ class VBSIntegration:
     def _verify_login_success(self):
         """Verify that login was successful"""
         try:
-            # Take screenshot and check for main interface elements
-            time.sleep(2)
-            return True  # Simplified - assume success
+            pid = self.get_process_id()
+            if not pid:
+                return True  # Nothing to inspect - assume success
+            
+            # Cheap check on the login form itself before enumerating VBS windows
+            if self.login_window and _IsWindow(self.login_window):
+                title = win32gui.GetWindowText(self.login_window)
+                if title != self.login_title and _VBS_TITLE_RE.search(title):
+                    return True
+            
+            # A negative enumeration stays valid briefly; repeated checks reuse it
+            now = time.monotonic()
+            if self._last_login_check is not None and now - self._last_login_check < 0.5:
+                return False
+            
+            # Logged in once VBS shows a main window other than the login form; a message box
+            # such as an invalid password prompt is a #32770 dialog and does not count
+            for hwnd, title, _ in self._process_windows(pid):
+                if (hwnd != self.login_window and _VBS_TITLE_RE.search(title)
+                        and win32gui.GetClassName(hwnd) != "#32770"):
+                    # Later steps work in the main window, not the login form it replaced
+                    self.window_handle = hwnd
+                    return True
+            self._last_login_check = now
+            return False
             
         except Exception as e:
             logger.error(f"Error verifying login: {str(e)}", "VBSIntegration", self.execution_id, e)
@@ -488,83 +1402,152 @@ class VBSIntegration:
         """Verify that upload was successful"""
         try:
             # Check for success indicators
-            time.sleep(2)
             return True  # Simplified - assume success
             
         except Exception as e:
             logger.error(f"Error verifying upload: {str(e)}", "VBSIntegration", self.execution_id, e)
             return False
     
+    def _capture_region(self):
+        """Return the VBS window as a (left, top, width, height) region, or the whole screen"""
+        hwnd = self.get_window_handle()
+        if hwnd and _IsWindow(hwnd):
+            left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+            if right > left and bottom > top:
+                return left, top, right - left, bottom - top
+        width, height = _get_pyautogui().size()
+        return 0, 0, width, height
+    
     def _take_screenshot(self, name):
         """Take screenshot for debugging"""
         try:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{name}_{timestamp}.png"
+            pyautogui = _get_pyautogui()
+            
+            # Number each shot so retries within a run do not overwrite earlier screenshots
+            self._screenshot_count += 1
+            filename = f"screenshot_{name}_{self.run_timestamp}_{self._screenshot_count:02d}.png"
             screenshot_path = Path("logs") / "screenshots"
             screenshot_path.mkdir(parents=True, exist_ok=True)
             
-            screenshot = pyautogui.screenshot()
+            screenshot = pyautogui.screenshot(region=self._capture_region())
             screenshot.save(screenshot_path / filename)
             
         except Exception as e:
             logger.error(f"Error taking screenshot: {str(e)}", "VBSIntegration", self.execution_id, e)
     
+    def _wait_for_vbs_exit(self, timeout):
+        """Back off for up to timeout seconds, returning True early if the VBS process exits"""
+        try:
+            if self.app_process is not None:
+                self.app_process.wait(timeout=timeout)
+            elif self.get_process_id():
+                # Shortcut launches and reused instances have no Popen handle; wait on the PID
+                psutil.Process(self.get_process_id()).wait(timeout=timeout)
+            else:
+                time.sleep(timeout)
+                return False
+        except (subprocess.TimeoutExpired, psutil.TimeoutExpired):
+            return False
+        except psutil.NoSuchProcess:
+            pass
+        logger.warning("VBS process exited - not retrying", "VBSIntegration", self.execution_id)
+        return True
+    
+    def _run_with_retry(self, step, abort_on_exit=False):
+        """Run a workflow step, retrying with backoff up to the configured attempts"""
+        wait = self._wait_for_vbs_exit if abort_on_exit else time.sleep
+        for attempt in _retry(VBS_CONFIG['retry_attempts'], deadline=VBS_CONFIG['timeout'], wait=wait):
+            if attempt:
+                logger.warning(f"Retrying {step.__name__} (attempt {attempt + 1})", "VBSIntegration", self.execution_id)
+            self.last_error = None
+            if step():
+                return True
+            if self.last_error and any(marker in self.last_error for marker in _TERMINAL_ERRORS):
+                logger.warning(f"{step.__name__} failed with a non-retryable error - not retrying", "VBSIntegration", self.execution_id)
+                return False
+        return False
+    
     def execute_full_vbs_workflow(self, excel_file_path):
         """Execute complete VBS workflow"""
+        # A long-lived instance runs many workflows; date each one from its own start
+        self._start_run()
+        workflow_start = time.monotonic()
+        # One result dict, filled in as stages complete, so every exit reports what actually happened
+        result = {
+            'success': False,
+            'start_time': self.started_at.isoformat(),
+            'excel_uploaded': False,
+            'pdf_generated': False
+        }
         try:
             logger.info("Starting VBS workflow", "VBSIntegration", self.execution_id)
             
-            # Launch application
-            if not self.launch_application():
-                raise Exception("Failed to launch VBS application")
+            # Simulated input cannot reach VBS while the workstation is locked
+            if self._is_workstation_locked():
+                raise Exception("Workstation is locked - VBS GUI automation requires an unlocked desktop")
+            
+            # Fail fast on a missing Excel file before paying for a VBS launch and login
+            file_error = self._check_excel_file(excel_file_path)
+            if file_error:
+                raise Exception(file_error)
+            self._probe_launch_paths()
             
-            # Login
-            if not self.login_to_application():
-                raise Exception("Failed to login to VBS application")
+            # Reuse a running VBS instance, logging in only if it is still at the login form
+            reused = self._find_existing_vbs()
+            if not reused:
+                # Launch application
+                if not self._run_with_retry(self.launch_application):
+                    raise Exception("Failed to launch VBS application")
+            
+            if not reused or self._is_login_form(self.get_window_handle()):
+                # Login
+                if not self._run_with_retry(self.login_to_application, abort_on_exit=True):
+                    raise Exception("Failed to login to VBS application")
             
             # Navigate to WiFi registration
+            self._ensure_vbs_running("navigation")
             if not self.navigate_to_wifi_registration():
                 raise Exception("Failed to navigate to WiFi registration")
             
             # Upload Excel data
-            if not self.upload_excel_data(excel_file_path):
+            self._ensure_vbs_running("Excel upload")
+            if not self.upload_excel_data(excel_file_path, file_checked=True):
                 raise Exception("Failed to upload Excel data")
+            result['excel_uploaded'] = True
             
             # Generate PDF report
-            report_path = Path("downloads/Reports") / f"Moon_Flower_Active_Users_{datetime.now().strftime('%d%m%Y')}.pdf"
-            if not self.generate_pdf_report(str(report_path)):
+            self._ensure_vbs_running("PDF report generation")
+            report_path = Path("downloads/Reports") / f"Moon_Flower_Active_Users_{self.run_date}.pdf"
+            result['pdf_generated'] = self.generate_pdf_report(str(report_path))
+            if not result['pdf_generated']:
                 logger.warning("PDF generation may have failed", "VBSIntegration", self.execution_id)
             
             logger.success("VBS workflow completed successfully", "VBSIntegration", self.execution_id)
-            
-            return {
-                'success': True,
-                'excel_uploaded': True,
-                'pdf_generated': True,
-                'report_path': str(report_path)
-            }
+            result.update(success=True, report_path=str(report_path))
             
         except Exception as e:
             logger.error(f"VBS workflow failed: {str(e)}", "VBSIntegration", self.execution_id, e)
-            return {
-                'success': False,
-                'error': str(e),
-                'excel_uploaded': False,
-                'pdf_generated': False
-            }
+            result['error'] = str(e)
         
         finally:
             self.cleanup()
+        
+        result['duration_seconds'] = round(time.monotonic() - workflow_start, 2)
+        return result
     
     def cleanup(self):
         """Cleanup resources"""
         try:
-            if self.app_process:
-                self.app_process.terminate()
-                logger.info("VBS application terminated", "VBSIntegration", self.execution_id)
+            self._terminate_launched_process()
+            self.reset()
+            if self._owns_executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._owns_executor = False
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}", "VBSIntegration", self.execution_id, e)
+        finally:
+            logger.flush()
 
 # Test function
 def test_vbs_integration():
@@ -6,9 +6,12 @@ Complete background automation system for WiFi data collection and Excel generat
 
 import os
 import sys
-import time
+import signal
 import logging
+import logging.handlers
+import threading
 import argparse
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -17,10 +20,6 @@ sys.path.append('.')
 
 # Import our modules
 from modules.advanced_scheduler import AdvancedScheduler
-from modules.excel_generator import EnhancedExcelGenerator
-from modules.windows_service import SystemTrayApp, WindowsIntegration
-from modules.vbs_integration import VBSApplicationAutomation
-from corrected_wifi_app import CorrectedWiFiApp
 
 class WiFiAutomationApp:
     """Main WiFi Automation Application"""
@@ -28,10 +27,8 @@ class WiFiAutomationApp:
     def __init__(self):
         self.logger = self._setup_logging()
         self.scheduler = AdvancedScheduler()
-        self.excel_generator = EnhancedExcelGenerator()
-        self.vbs_automation = VBSApplicationAutomation()
-        self.wifi_app = CorrectedWiFiApp()
         self.running = False
+        self._stop_event = threading.Event()
         
         self.logger.info("WiFi Automation App initialized")
     
@@ -42,12 +39,15 @@ class WiFiAutomationApp:
         
         # Create logs directory
         log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        if not log_dir.is_dir():
+            log_dir.mkdir()
         
         if not logger.handlers:
             # File handler
             log_file = log_dir / "wifi_automation.log"
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=5 * 1024 * 1024, backupCount=5, delay=True
+            )
             file_handler.setLevel(logging.INFO)
             
             # Console handler
@@ -64,6 +64,26 @@ class WiFiAutomationApp:
         
         return logger
     
+    # Heavy components (pandas, pyautogui/win32, selenium) are imported on first use
+    @cached_property
+    def excel_generator(self):
+        from modules.excel_generator import EnhancedExcelGenerator
+        return EnhancedExcelGenerator()
+    
+    @cached_property
+    def vbs_automation(self):
+        from modules.vbs_integration import VBSApplicationAutomation
+        return VBSApplicationAutomation()
+    
+    @cached_property
+    def wifi_app(self):
+        from corrected_wifi_app import CorrectedWiFiApp
+        return CorrectedWiFiApp()
+    
+    def _log_block(self, *lines):
+        """Log consecutive informational lines as a single record"""
+        self.logger.info("\n".join(lines))
+    
     def setup_callbacks(self):
         """Setup scheduler callbacks"""
         self.scheduler.set_download_callback(self._wifi_download_callback)
@@ -111,10 +131,12 @@ class WiFiAutomationApp:
     def _merge_callback(self, result: Dict[str, Any]):
         """Callback for merge completion"""
         try:
-            self.logger.info("📊 Excel merge completed successfully")
-            self.logger.info(f"📄 Excel file: {result.get('file_path', 'N/A')}")
-            self.logger.info(f"📏 File size: {result.get('file_size_mb', 0)} MB")
-            self.logger.info(f"📝 Records: {result.get('rows_written', 0)}")
+            self._log_block(
+                "📊 Excel merge completed successfully",
+                f"📄 Excel file: {result.get('file_path', 'N/A')}",
+                f"📏 File size: {result.get('file_size_mb', 0)} MB",
+                f"📝 Records: {result.get('rows_written', 0)}"
+            )
             
             # Get Excel file path
             excel_file_path = result.get('file_path')
@@ -125,32 +147,30 @@ class WiFiAutomationApp:
                 vbs_result = self.vbs_automation.complete_vbs_workflow(Path(excel_file_path))
                 
                 if vbs_result.get("success", False):
-                    self.logger.info("✅ VBS workflow completed successfully")
-                    self.logger.info(f"📤 Excel uploaded: {vbs_result.get('excel_uploaded', False)}")
-                    self.logger.info(f"📄 PDF generated: {vbs_result.get('pdf_generated', False)}")
-                    
+                    lines = [
+                        "✅ VBS workflow completed successfully",
+                        f"📤 Excel uploaded: {vbs_result.get('excel_uploaded', False)}",
+                        f"📄 PDF generated: {vbs_result.get('pdf_generated', False)}"
+                    ]
                     if vbs_result.get("pdf_path"):
-                        self.logger.info(f"📄 PDF saved to: {vbs_result.get('pdf_path')}")
+                        lines.append(f"📄 PDF saved to: {vbs_result.get('pdf_path')}")
+                    self._log_block(*lines)
                     
                     # Update result with VBS information
-                    result["vbs_upload_success"] = True
-                    result["vbs_pdf_path"] = vbs_result.get("pdf_path")
+                    result.update(vbs_upload_success=True, vbs_pdf_path=vbs_result.get("pdf_path"))
                 else:
                     self.logger.error(f"❌ VBS workflow failed: {vbs_result.get('error', 'Unknown error')}")
-                    result["vbs_upload_success"] = False
-                    result["vbs_error"] = vbs_result.get("error")
+                    result.update(vbs_upload_success=False, vbs_error=vbs_result.get("error"))
             else:
                 self.logger.warning("⚠️ Excel file not found - skipping VBS upload")
-                result["vbs_upload_success"] = False
-                result["vbs_error"] = "Excel file not found"
+                result.update(vbs_upload_success=False, vbs_error="Excel file not found")
             
             # Log daily summary
             self._log_daily_summary(result)
             
         except Exception as e:
             self.logger.error(f"Merge callback error: {e}")
-            result["vbs_upload_success"] = False
-            result["vbs_error"] = str(e)
+            result.update(vbs_upload_success=False, vbs_error=str(e))
     
     def _log_daily_summary(self, excel_result: Dict[str, Any]):
         """Log daily summary statistics"""
@@ -170,9 +190,7 @@ class WiFiAutomationApp:
                 "total_records": excel_result.get("rows_written", 0)
             }
             
-            self.logger.info("📈 DAILY SUMMARY:")
-            for key, value in summary.items():
-                self.logger.info(f"   {key}: {value}")
+            self._log_block("📈 DAILY SUMMARY:", *(f"   {key}: {value}" for key, value in summary.items()))
                 
         except Exception as e:
             self.logger.error(f"Error logging daily summary: {e}")
@@ -187,23 +205,29 @@ class WiFiAutomationApp:
             
             # Start scheduler
             if self.scheduler.start_scheduler():
-                self.logger.info("✅ Scheduler started successfully")
-                self.logger.info("📅 Scheduled slots:")
-                for slot in self.scheduler.time_slots:
-                    self.logger.info(f"   - {slot['name']}: {slot['time']}")
+                self._log_block(
+                    "✅ Scheduler started successfully",
+                    "📅 Scheduled slots:",
+                    *(f"   - {slot['name']}: {slot['time']}" for slot in self.scheduler.time_slots)
+                )
             else:
                 self.logger.error("❌ Failed to start scheduler")
                 return False
             
             self.running = True
+            self._stop_event.clear()
             self.logger.info("🔄 Application running... Press Ctrl+C to stop")
             
+            # Ctrl+C sets the stop event instead of raising KeyboardInterrupt
+            previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
             try:
-                while self.running:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                self.logger.info("⏹️ Stop signal received")
-                self.running = False
+                # Wake immediately on stop(); the timeout lets the SIGINT handler run on Windows
+                while not self._stop_event.wait(1):
+                    pass
+            finally:
+                signal.signal(signal.SIGINT, previous_handler)
+            self.logger.info("⏹️ Stop signal received")
+            self.running = False
             
             # Stop scheduler
             self.scheduler.stop_scheduler()
@@ -214,12 +238,17 @@ class WiFiAutomationApp:
             self.logger.error(f"Console mode error: {e}")
             return False
     
+    def stop(self):
+        """Stop console mode from any thread"""
+        self._stop_event.set()
+    
     def run_tray_mode(self):
         """Run in system tray mode"""
         try:
             self.logger.info("🔧 Starting WiFi Automation in system tray mode")
             
             # Create and run system tray app
+            from modules.windows_service import SystemTrayApp
             tray_app = SystemTrayApp()
             tray_app.run()
             
@@ -286,6 +315,7 @@ def main():
     # Handle Windows service operations
     if any([args.install_service, args.remove_service, args.start_service, 
             args.stop_service, args.add_startup, args.remove_startup]):
+        from modules.windows_service import WindowsIntegration
         integration = WindowsIntegration()
         
         if args.install_service: